@@ -13,7 +13,202 @@ import requests
 import time
 import sys
 import argparse
-import json
+import orjson
+import random
+import queue
+import threading
+
+# Directions: N, NE, E, SE, S, SW, W, NW
+DIRS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+
+def _ray_len(x, y, dx, dy):
+    steps_x = (7 - x) if dx > 0 else (x if dx < 0 else 7)
+    steps_y = (7 - y) if dy > 0 else (y if dy < 0 else 7)
+    return min(steps_x, steps_y)
+
+# RAY_LEN[y][x][d]: steps from (x, y) to the board edge along DIRS[d],
+# so the board-walking loops below need no per-step bounds checks
+RAY_LEN = [[[_ray_len(x, y, dx, dy) for dx, dy in DIRS]
+            for x in range(8)] for y in range(8)]
+
+# --- Zobrist hashing & transposition table ---
+# Random 64-bit keys per (piece, square) plus one for the side to move.
+# Seeded so hashes are stable across runs (useful for debugging).
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST = [[_zobrist_rng.getrandbits(64) for _ in range(64)] for _ in range(2)]
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+# Entry flags: exact score, lower bound (fail-high), upper bound (fail-low)
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Classic positional weight matrix: corners are decisive, the squares
+# next to an empty corner are liabilities, edges are mildly valuable.
+POSITION_WEIGHTS = (
+    (100, -20,  10,   5,   5,  10, -20, 100),
+    (-20, -50,  -2,  -2,  -2,  -2, -50, -20),
+    ( 10,  -2,  -1,  -1,  -1,  -1,  -2,  10),
+    (  5,  -2,  -1,  -1,  -1,  -1,  -2,   5),
+    (  5,  -2,  -1,  -1,  -1,  -1,  -2,   5),
+    ( 10,  -2,  -1,  -1,  -1,  -1,  -2,  10),
+    (-20, -50,  -2,  -2,  -2,  -2, -50, -20),
+    (100, -20,  10,   5,   5,  10, -20, 100),
+)
+
+# Flat view of the weight matrix matching the bytearray board layout
+FLAT_WEIGHTS = tuple(w for row in POSITION_WEIGHTS for w in row)
+
+# Optional Numba acceleration: when numba (and numpy) are installed, the
+# numeric leaf loops of the search are JIT-compiled; otherwise the pure
+# Python implementations below are used unchanged.
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    _count_flips_jit = None
+    _evaluate_jit = None
+else:
+    _RAY_ARR = np.array(RAY_LEN, dtype=np.int8)
+    _DIR_STEPS = np.array([dy * 8 + dx for dx, dy in DIRS], dtype=np.int8)
+    _WEIGHTS_ARR = np.array(FLAT_WEIGHTS, dtype=np.int32)
+
+    @njit(cache=True)
+    def _count_flips_jit(board, x, y, player):
+        opponent = 3 - player
+        total = 0
+        for d in range(8):
+            step = _DIR_STEPS[d]
+            i = y * 8 + x
+            count = 0
+            hit = False
+            for _ in range(_RAY_ARR[y, x, d]):
+                i += step
+                if board[i] != opponent:
+                    hit = True
+                    break
+                count += 1
+            if hit and board[i] == player:
+                total += count
+        return total
+
+    @njit(cache=True)
+    def _evaluate_jit(board, player):
+        opponent = 3 - player
+        score = 0
+        for i in range(64):
+            piece = board[i]
+            if piece == player:
+                score += _WEIGHTS_ARR[i]
+            elif piece == opponent:
+                score -= _WEIGHTS_ARR[i]
+        return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside negamax when the per-turn time budget runs out."""
+    pass
+
+
+def flatten_board(rows):
+    """
+    Converts the API's 8x8 nested-list board into the flat bytearray(64)
+    used by the search (index y*8+x, one contiguous cache-friendly buffer).
+    """
+    return bytearray(piece for row in rows for piece in row)
+
+
+def zobrist_hash(board, player):
+    """
+    Computes the Zobrist hash of a position: XOR of one random key per
+    occupied square, plus a side-to-move key when White is to play.
+    """
+    h = 0
+    for i in range(64):
+        piece = board[i]
+        if piece:
+            h ^= ZOBRIST[piece - 1][i]
+    if player == 2:
+        h ^= ZOBRIST_SIDE
+    return h
+
+
+def _build_symmetry_perms():
+    # The 8 symmetries of the square (D4): rotations, mirrors, transposes.
+    transforms = (
+        lambda x, y: (x, y),
+        lambda x, y: (7 - y, x),        # rotate 90
+        lambda x, y: (7 - x, 7 - y),    # rotate 180
+        lambda x, y: (y, 7 - x),        # rotate 270
+        lambda x, y: (y, x),            # transpose
+        lambda x, y: (7 - x, y),        # mirror horizontally
+        lambda x, y: (x, 7 - y),        # mirror vertically
+        lambda x, y: (7 - y, 7 - x),    # anti-transpose
+    )
+    perms = []
+    for t in transforms:
+        perm = [0] * 64
+        for y in range(8):
+            for x in range(8):
+                tx, ty = t(x, y)
+                perm[y * 8 + x] = ty * 8 + tx
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+# SYMMETRY_PERMS[s][i]: square index i mapped through symmetry s
+SYMMETRY_PERMS = _build_symmetry_perms()
+
+
+def canonical_hash(board, player):
+    """
+    Zobrist hash folded over the board's 8 symmetries: the minimum hash
+    across all D4 images. Mirror-image opening lines then share one
+    transposition-table entry, multiplying the hit rate near the start.
+    """
+    best = None
+    for perm in SYMMETRY_PERMS:
+        h = 0
+        for i in range(64):
+            piece = board[i]
+            if piece:
+                h ^= ZOBRIST[piece - 1][perm[i]]
+        if player == 2:
+            h ^= ZOBRIST_SIDE
+        if best is None or h < best:
+            best = h
+    return best
+
+
+class TranspositionTable:
+    """
+    Caches search results keyed by position hash so identical states reached
+    through different move orders are evaluated once.
+
+    Each bucket holds two slots ("TwoBig" replacement): the deepest entry
+    seen so far, plus an always-replace slot for the most recent one.
+    Entries are (depth, value, flag, best_move) tuples.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    def probe(self, key):
+        """Returns the (deep, recent) slot pair for a hash, or None."""
+        return self.buckets.get(key)
+
+    def store(self, key, depth, value, flag, move):
+        entry = (depth, value, flag, move)
+        slots = self.buckets.get(key)
+        if slots is None:
+            self.buckets[key] = [entry, None]
+        elif depth >= slots[0][0]:
+            # Depth-preferred slot: demote the old deep entry to 'recent'
+            slots[1] = slots[0]
+            slots[0] = entry
+        else:
+            slots[1] = entry
+
 
 class GreedyAI:
     def __init__(self, api_url, game_id, player_side):
@@ -27,6 +222,17 @@ class GreedyAI:
         self.game_id = game_id
         self.player_side = player_side
         self.token = None  # Secured token received after claiming a side
+        # Persistent HTTP session: keep-alive connection pooling avoids a
+        # fresh TCP (and TLS) handshake on every API call
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.tt = TranspositionTable()  # Shared across turns of the game
+        self.max_depth = 8              # Iterative deepening ceiling
+        self.time_budget = 1.0          # Seconds of search per turn
+        self.symmetry_min_depth = 4     # Canonicalize TT keys above this depth
+        self._deadline = 0.0
 
     def claim_side(self):
         """
@@ -36,7 +242,7 @@ class GreedyAI:
         print(f"[*] Attempting to claim side {self.player_side} for game {self.game_id}...")
         try:
             # POST /game/{id}/claim | Payload: {"player": int}
-            resp = requests.post(f"{self.api_url}/game/{self.game_id}/claim", json={"player": self.player_side})
+            resp = self.session.post(f"{self.api_url}/game/{self.game_id}/claim", json={"player": self.player_side})
             if resp.status_code == 200:
                 data = resp.json()
                 self.token = data["token"]
@@ -56,7 +262,7 @@ class GreedyAI:
         """
         try:
             # GET /game/{id}
-            resp = requests.get(f"{self.api_url}/game/{self.game_id}")
+            resp = self.session.get(f"{self.api_url}/game/{self.game_id}")
             if resp.status_code == 200:
                 return resp.json()
         except Exception as e:
@@ -65,48 +271,223 @@ class GreedyAI:
 
     def find_best_move(self, state):
         """
-        Analyzes the current state and returns the move that maximizes immediate captures.
-        This is a simple 'Greedy' heuristic.
+        Analyzes the current state with iterative-deepening alpha-beta
+        negamax. Each completed depth seeds move ordering for the next one
+        (its best move is searched first), and the transposition table
+        carries bounds between iterations. When the time budget runs out,
+        the best move from the last fully completed depth is returned.
         """
-        board = state["board"]
-        valid_moves = state["valid_moves"] # The API provides a list of valid moves (x, y)
+        board = flatten_board(state["board"])
+        valid_moves = [tuple(m) for m in state["valid_moves"]]
         if not valid_moves:
             return None
-        
+
+        h = zobrist_hash(board, self.player_side)
+        self._deadline = time.monotonic() + self.time_budget
         best_move = valid_moves[0]
-        max_flips = -1
-        
-        for x, y in valid_moves:
-            # We calculate how many pieces would be flipped if we move here
-            flips = self.count_flips(board, x, y, self.player_side)
-            if flips > max_flips:
-                max_flips = flips
-                best_move = (x, y)
-        
+
+        for depth in range(1, self.max_depth + 1):
+            # Search the previous iteration's best move first
+            ordered = [best_move] + [m for m in valid_moves if m != best_move]
+            alpha, beta = float("-inf"), float("inf")
+            depth_best = None
+            try:
+                for x, y in ordered:
+                    flipped, child_h = self.apply_move(board, x, y, self.player_side, h)
+                    value = -self.negamax(board, 3 - self.player_side,
+                                          depth - 1, -beta, -alpha, child_h)
+                    self.undo_move(board, x, y, self.player_side, flipped)
+                    if value > alpha:
+                        alpha = value
+                        depth_best = (x, y)
+            except SearchTimeout:
+                break
+            if depth_best is not None:
+                best_move = depth_best
+            root_key = (canonical_hash(board, self.player_side)
+                        if depth >= self.symmetry_min_depth else h)
+            self.tt.store(root_key, depth, alpha, TT_EXACT, best_move)
+
         return best_move
 
+    def negamax(self, board, player, depth, alpha, beta, h):
+        """
+        Negamax with alpha-beta bounds, probing the transposition table
+        before searching: exact hits at sufficient depth are returned
+        directly, and stored bounds can cut off immediately.
+        """
+        if time.monotonic() > self._deadline:
+            raise SearchTimeout()
+
+        # Near the root, fold the 8 board symmetries into the TT key so
+        # mirror-image lines share entries; the canonicalization is too
+        # expensive to pay at shallow (numerous) nodes. Stored move hints
+        # may come from a mirrored position; they are ignored below when
+        # they aren't legal here.
+        if depth >= self.symmetry_min_depth:
+            key = canonical_hash(board, player)
+        else:
+            key = h
+
+        tt_move = None
+        slots = self.tt.probe(key)
+        if slots:
+            for entry in slots:
+                if entry is None:
+                    continue
+                if tt_move is None:
+                    tt_move = entry[3]
+                if entry[0] < depth:
+                    continue
+                _, value, flag, _ = entry
+                if flag == TT_EXACT:
+                    return value
+                if flag == TT_LOWER and value >= beta:
+                    return value
+                if flag == TT_UPPER and value <= alpha:
+                    return value
+
+        if depth <= 0:
+            return self.evaluate(board, player)
+
+        moves = self.get_moves(board, player)
+        if not moves:
+            if not self.get_moves(board, 3 - player):
+                # Terminal position: score by final disc count
+                diff = self.disc_diff(board, player)
+                return 0 if diff == 0 else (10000 if diff > 0 else -10000)
+            # Pass: opponent moves again
+            return -self.negamax(board, 3 - player, depth, -beta, -alpha,
+                                 h ^ ZOBRIST_SIDE)
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        original_alpha = alpha
+        best_value = float("-inf")
+        best_move = None
+        for x, y in moves:
+            flipped, child_h = self.apply_move(board, x, y, player, h)
+            value = -self.negamax(board, 3 - player, depth - 1, -beta, -alpha, child_h)
+            self.undo_move(board, x, y, player, flipped)
+            if value > best_value:
+                best_value = value
+                best_move = (x, y)
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break  # Beta cutoff
+
+        if best_value <= original_alpha:
+            flag = TT_UPPER
+        elif best_value >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self.tt.store(key, depth, best_value, flag, best_move)
+        return best_value
+
+    def evaluate(self, board, player):
+        """
+        Static evaluation: positional weight differential from `player`'s
+        perspective (corners dominate, corner-adjacent squares penalized).
+        """
+        if _evaluate_jit is not None:
+            return int(_evaluate_jit(np.frombuffer(board, dtype=np.int8), player))
+
+        opponent = 3 - player
+        score = 0
+        for i in range(64):
+            piece = board[i]
+            if piece == player:
+                score += FLAT_WEIGHTS[i]
+            elif piece == opponent:
+                score -= FLAT_WEIGHTS[i]
+        return score
+
+    def disc_diff(self, board, player):
+        """
+        Disc-count differential, used to score finished games.
+        """
+        # bytearray.count runs at C speed over the flat buffer
+        return board.count(player) - board.count(3 - player)
+
+    def get_moves(self, board, player):
+        """
+        Lists all legal moves for `player` on a local board copy.
+        """
+        return [(x, y) for y in range(8) for x in range(8)
+                if board[y * 8 + x] == 0 and self.count_flips(board, x, y, player) > 0]
+
+    def apply_move(self, board, x, y, player, h):
+        """
+        Plays a move on a local board, returning the flipped square indices
+        (for undo) and the incrementally updated Zobrist hash of the child.
+        """
+        opponent = 3 - player
+        rays = RAY_LEN[y][x]
+        flipped = []
+        for d, (dx, dy) in enumerate(DIRS):
+            step = dy * 8 + dx
+            line = []
+            i = y * 8 + x
+            capped = False
+            for _ in range(rays[d]):
+                i += step
+                piece = board[i]
+                if piece != opponent:
+                    capped = piece == player
+                    break
+                line.append(i)
+            if capped and line:
+                flipped.extend(line)
+
+        move_idx = y * 8 + x
+        board[move_idx] = player
+        h ^= ZOBRIST[player - 1][move_idx] ^ ZOBRIST_SIDE
+        for i in flipped:
+            board[i] = player
+            h ^= ZOBRIST[opponent - 1][i] ^ ZOBRIST[player - 1][i]
+        return flipped, h
+
+    def undo_move(self, board, x, y, player, flipped):
+        """
+        Reverts a move previously made with apply_move.
+        """
+        opponent = 3 - player
+        board[y * 8 + x] = 0
+        for i in flipped:
+            board[i] = opponent
+
     def count_flips(self, board, x, y, player):
         """
         Simulates move logic to count captures.
         """
+        if _count_flips_jit is not None:
+            # np.frombuffer shares memory with the bytearray board
+            return int(_count_flips_jit(np.frombuffer(board, dtype=np.int8),
+                                        x, y, player))
+
         opponent = 2 if player == 1 else 1
-        directions = [
-            (0, -1), (1, -1), (1, 0), (1, 1),
-            (0, 1), (-1, 1), (-1, 0), (-1, -1)
-        ]
-        
+        rays = RAY_LEN[y][x]
+
         total_flips = 0
-        for dx, dy in directions:
+        for d, (dx, dy) in enumerate(DIRS):
+            step = dy * 8 + dx
             count = 0
-            nx, ny = x + dx, y + dy
-            # Travel in direction while seeing opponent pieces
-            while 0 <= nx < 8 and 0 <= ny < 8 and board[ny][nx] == opponent:
+            i = y * 8 + x
+            # Travel in direction while seeing opponent pieces; the ray
+            # length bounds the walk so no coordinate check is needed
+            for _ in range(rays[d]):
+                i += step
+                if board[i] != opponent:
+                    break
                 count += 1
-                nx += dx
-                ny += dy
-            
+            else:
+                continue  # Ran off the board without hitting our own piece
+
             # If we hit our own piece at the end, the chain is valid
-            if 0 <= nx < 8 and 0 <= ny < 8 and board[ny][nx] == player:
+            if board[i] == player:
                 total_flips += count
         return total_flips
 
@@ -118,7 +499,7 @@ class GreedyAI:
         print(f"[*] AI moving to ({x}, {y})...")
         try:
             # POST /game/{id}/move | Payload: {"x": int, "y": int, "player": int, "token": str}
-            resp = requests.post(
+            resp = self.session.post(
                 f"{self.api_url}/game/{self.game_id}/move",
                 json={"x": x, "y": y, "player": self.player_side, "token": self.token}
             )
@@ -133,45 +514,91 @@ class GreedyAI:
 
     def run(self):
         """
-        Main execution loop. Uses Server-Sent Events (SSE) for real-time turn monitoring.
-        This allows the AI to react instantly without heavy polling.
+        Main execution loop. An SSE reader thread feeds the freshest game
+        state into a 1-slot queue, and this thread consumes it and plays.
+        If several move events arrive while a search is still running, the
+        stale states are discarded, so the AI always acts on the latest
+        position instead of queueing up work for outdated ones.
         """
         if not self.claim_side():
             return
-        
+
         role = 'Black' if self.player_side == 1 else 'White'
         print(f"[*] AI ({role}) is active and listening for events...")
-        
-        # 1. Initial State Check: Check if it's already our turn
-        state = self.get_state()
-        if state and state["current_turn"] == self.player_side:
-            self.play_turn(state)
 
-        # 2. Event Loop: Listen for real-time game updates via SSE
+        self._state_queue = queue.Queue(maxsize=1)
+        reader = threading.Thread(target=self._event_reader, daemon=True)
+        reader.start()
+
+        while True:
+            state = self._state_queue.get()
+            if state is None:
+                # Sentinel from the reader: game finished
+                print("[*] Game is over.")
+                return
+            if state["current_turn"] == self.player_side:
+                self.play_turn(state)
+
+    def _push_state(self, state):
+        """
+        Puts a state into the 1-slot queue, evicting any stale one.
+        """
+        while True:
+            try:
+                self._state_queue.put(state, block=False)
+                return
+            except queue.Full:
+                try:
+                    self._state_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _event_reader(self):
+        """
+        Producer thread: listens for real-time game updates via SSE,
+        reconnecting with exponential backoff when the stream drops. SSE is
+        persistent and push-based, so no polling is needed while idle.
+        """
         url = f"{self.api_url}/game/{self.game_id}/events"
-        try:
-            # We use stream=True to process the long-running HTTP connection
-            response = requests.get(url, stream=True)
-            for line in response.iter_lines():
-                if line:
+        backoff = 1
+        while True:
+            # On (re)connect, sync state in case it's already our turn
+            state = self.get_state()
+            if state:
+                if state["is_over"]:
+                    self._push_state(None)
+                    return
+                self._push_state(state)
+            try:
+                # We use stream=True to process the long-running HTTP connection
+                response = self.session.get(url, stream=True,
+                                        headers={"Accept": "text/event-stream"})
+                # An error response (e.g. 404 after a server restart wiped
+                # the game) is not an exception; raise so it backs off too
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    backoff = 1  # Stream is healthy again
                     decoded = line.decode('utf-8')
                     if decoded.startswith('data: '):
                         # Parse the SSE 'data' field
-                        event_data = json.loads(decoded[6:])
-                        
+                        event_data = orjson.loads(decoded[6:])
+
                         # We only care about 'move' events which signal a change in turn
                         if event_data.get("type") == "move":
                             state = event_data["state"]
-                            if not state["is_over"] and state["current_turn"] == self.player_side:
-                                self.play_turn(state)
-        except Exception as e:
-            print(f"[!] SSE connection lost ({e}). Falling back to manual polling.")
-            # Fallback to standard polling if SSE fails
-            while True:
-                state = self.get_state()
-                if state and not state["is_over"] and state["current_turn"] == self.player_side:
-                    self.play_turn(state)
-                time.sleep(1)
+                            if state["is_over"]:
+                                self._push_state(None)
+                                return
+                            self._push_state(state)
+                print(f"[!] SSE stream ended. Reconnecting in {backoff}s...")
+            except Exception as e:
+                print(f"[!] SSE connection lost ({e}). Reconnecting in {backoff}s...")
+            # Always pause before reconnecting so a dead or erroring server
+            # isn't hammered in a tight loop
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
 
     def play_turn(self, state):
         """
@@ -1,4 +1,5 @@
 import time
+import secrets
 from typing import List, Tuple, Optional
 from pydantic import BaseModel, Field
 import uuid
@@ -13,26 +14,114 @@ class GameSettings(BaseModel):
     black_is_human: bool = True
     white_is_human: bool = True
 
+# Shared default: validated once at import instead of on every
+# ReversiGame() construction
+_DEFAULT_SETTINGS = GameSettings()
+
+# Bitboard layout: bit (y * 8 + x) holds the piece at (x, y).
+FULL_MASK = 0xFFFFFFFFFFFFFFFF
+NOT_FILE_A = 0xFEFEFEFEFEFEFEFE  # every square with x > 0
+NOT_FILE_H = 0x7F7F7F7F7F7F7F7F  # every square with x < 7
+
+# (shift amount, wrap mask) per direction: N, NE, E, SE, S, SW, W, NW.
+# The mask clears bits that wrapped across the board edge after shifting.
+SHIFT_DIRS = (
+    (-8, FULL_MASK), (-7, NOT_FILE_A), (1, NOT_FILE_A), (9, NOT_FILE_A),
+    (8, FULL_MASK), (7, NOT_FILE_H), (-1, NOT_FILE_H), (-9, NOT_FILE_H),
+)
+
+def _shift(bb: int, d: int) -> int:
+    return (bb << d) & FULL_MASK if d > 0 else bb >> -d
+
+def legal_moves_bb(P: int, O: int) -> int:
+    # Parallel-prefill move generation: for each direction, flood from the
+    # player's pieces across runs of opponent pieces (6 steps cover the
+    # longest possible run), then step once more onto an empty square.
+    empty = ~(P | O) & FULL_MASK
+    moves = 0
+    for d, mask in SHIFT_DIRS:
+        t = _shift(P, d) & mask & O
+        for _ in range(5):
+            t |= _shift(t, d) & mask & O
+        moves |= _shift(t, d) & mask & empty
+    return moves
+
+def _build_rays():
+    rays = []
+    for i in range(64):
+        x, y = i & 7, i >> 3
+        per_square = []
+        for dx, dy in ((0, -1), (1, -1), (1, 0), (1, 1),
+                       (0, 1), (-1, 1), (-1, 0), (-1, -1)):
+            ray = []
+            nx, ny = x + dx, y + dy
+            while 0 <= nx < 8 and 0 <= ny < 8:
+                ray.append(1 << (ny * 8 + nx))
+                nx += dx
+                ny += dy
+            # A capture needs at least one opponent piece plus a capper,
+            # so one-square rays can never flip anything
+            if len(ray) >= 2:
+                per_square.append(tuple(ray))
+        rays.append(tuple(per_square))
+    return tuple(rays)
+
+# RAYS[sq]: per useful direction, the square bits from sq to the board
+# edge in walking order. All 512 rays are fixed at import, specializing
+# the flip computation per square: no shifting or edge masking per step.
+RAYS = _build_rays()
+
+def flip_mask_for_square(i: int, P: int, O: int) -> int:
+    # "Sandwich" computation along precomputed rays: accumulate the run of
+    # opponent pieces and keep it only if capped by one of P's pieces.
+    flips = 0
+    for ray in RAYS[i]:
+        line = 0
+        for bit in ray:
+            if O & bit:
+                line |= bit
+                continue
+            if P & bit:
+                flips |= line
+            break
+    return flips
+
+class _BoardView:
+    # Read-only list-of-lists facade over the bitboard pair so existing
+    # callers (and tests) can keep indexing board[y][x].
+    def __init__(self, game: "ReversiGame"):
+        self._game = game
+
+    def __getitem__(self, y: int) -> List[int]:
+        return self._game._row(y)
+
+    def __iter__(self):
+        return iter(self._game._bb_to_list())
+
+    def __len__(self) -> int:
+        return 8
+
 class ReversiGame:
     BLACK = 1
     WHITE = 2
     EMPTY = 0
 
-    def __init__(self, settings: GameSettings = GameSettings()):
+    def __init__(self, settings: Optional[GameSettings] = None):
         self.game_id = str(uuid.uuid4())
         self.black_token = None
         self.white_token = None
-        self.settings = settings
-        
-        # Initialize board
-        self.board = [[self.EMPTY for _ in range(8)] for _ in range(8)]
-        # Starting pieces
-        self.board[3][3] = self.WHITE
-        self.board[3][4] = self.BLACK
-        self.board[4][3] = self.BLACK
-        self.board[4][4] = self.WHITE
-        
+        self.settings = settings or _DEFAULT_SETTINGS
+
+        # Initialize board with the four starting pieces
+        self.black_bb = (1 << (3 * 8 + 4)) | (1 << (4 * 8 + 3))
+        self.white_bb = (1 << (3 * 8 + 3)) | (1 << (4 * 8 + 4))
+        self.board = _BoardView(self)
+
         self.current_turn = self.BLACK
+        # Valid moves for the side to move, recomputed only when the board
+        # changes (get_state is hit on every poll and SSE broadcast)
+        self._cached_valid_moves: Optional[List[Tuple[int, int]]] = None
+        self._cached_valid_for: int = 0
         self.last_move_time = 0.0
         self.history = []
         self.is_over = False
@@ -41,7 +130,7 @@ class ReversiGame:
     def get_state(self):
         return {
             "game_id": self.game_id,
-            "board": self.board,
+            "board": self._bb_to_list(),
             "current_turn": self.current_turn,
             "is_over": self.is_over,
             "winner": self.winner,
@@ -53,57 +142,100 @@ class ReversiGame:
             }
         }
 
+    def to_dict(self) -> dict:
+        # Full snapshot for persistence (see the Redis store in main.py)
+        return {
+            "game_id": self.game_id,
+            "black_token": self.black_token,
+            "white_token": self.white_token,
+            "settings": self.settings.model_dump(),
+            "black_bb": self.black_bb,
+            "white_bb": self.white_bb,
+            "current_turn": self.current_turn,
+            "last_move_time": self.last_move_time,
+            "history": self.history,
+            "is_over": self.is_over,
+            "winner": self.winner,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReversiGame":
+        game = cls(GameSettings(**data["settings"]))
+        game.game_id = data["game_id"]
+        game.black_token = data["black_token"]
+        game.white_token = data["white_token"]
+        game.black_bb = data["black_bb"]
+        game.white_bb = data["white_bb"]
+        game.current_turn = data["current_turn"]
+        game.last_move_time = data["last_move_time"]
+        game.history = [tuple(move) for move in data["history"]]
+        game.is_over = data["is_over"]
+        game.winner = data["winner"]
+        return game
+
     def claim_side(self, player: int) -> Optional[str]:
+        # token_hex is cheaper than building a UUID and is guaranteed
+        # cryptographically strong for an authorization token
         if player == self.BLACK and self.black_token is None:
-            self.black_token = str(uuid.uuid4())
+            self.black_token = secrets.token_hex(16)
             return self.black_token
         if player == self.WHITE and self.white_token is None:
-            self.white_token = str(uuid.uuid4())
+            self.white_token = secrets.token_hex(16)
             return self.white_token
         return None
 
+    def _player_bbs(self, player: int) -> Tuple[int, int]:
+        # Returns (own pieces, opponent pieces) for the given player
+        if player == self.BLACK:
+            return self.black_bb, self.white_bb
+        return self.white_bb, self.black_bb
+
+    def _row(self, y: int) -> List[int]:
+        base = y * 8
+        return [
+            self.BLACK if (self.black_bb >> (base + x)) & 1
+            else self.WHITE if (self.white_bb >> (base + x)) & 1
+            else self.EMPTY
+            for x in range(8)
+        ]
+
+    def _bb_to_list(self) -> List[List[int]]:
+        # Only needed for JSON serialization in get_state
+        return [self._row(y) for y in range(8)]
+
     def get_scores(self):
-        black = sum(row.count(self.BLACK) for row in self.board)
-        white = sum(row.count(self.WHITE) for row in self.board)
-        return {"black": black, "white": white}
+        # int.bit_count() is a single popcount per bitboard (Python 3.10+)
+        return {
+            "black": self.black_bb.bit_count(),
+            "white": self.white_bb.bit_count()
+        }
 
     def is_valid_coord(self, x, y):
         return 0 <= x < 8 and 0 <= y < 8
 
     def get_valid_moves(self, player: int) -> List[Tuple[int, int]]:
+        if (player == self.current_turn and player == self._cached_valid_for
+                and self._cached_valid_moves is not None):
+            return self._cached_valid_moves
+        P, O = self._player_bbs(player)
+        moves_bb = legal_moves_bb(P, O)
         moves = []
-        for y in range(8):
-            for x in range(8):
-                if self.can_move(x, y, player):
-                    moves.append((x, y))
+        while moves_bb:
+            bit = moves_bb & -moves_bb
+            i = bit.bit_length() - 1
+            moves.append((i & 7, i >> 3))
+            moves_bb ^= bit
+        if player == self.current_turn:
+            self._cached_valid_moves = moves
+            self._cached_valid_for = player
         return moves
 
     def can_move(self, x: int, y: int, player: int) -> bool:
-        if self.board[y][x] != self.EMPTY:
+        i = y * 8 + x
+        P, O = self._player_bbs(player)
+        if (1 << i) & (P | O):
             return False
-        
-        opponent = self.WHITE if player == self.BLACK else self.BLACK
-        
-        # Directions: N, NE, E, SE, S, SW, W, NW
-        directions = [
-            (0, -1), (1, -1), (1, 0), (1, 1),
-            (0, 1), (-1, 1), (-1, 0), (-1, -1)
-        ]
-        
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if self.is_valid_coord(nx, ny) and self.board[ny][nx] == opponent:
-                # Keep going in this direction to see if we find our own piece
-                nx += dx
-                ny += dy
-                while self.is_valid_coord(nx, ny):
-                    if self.board[ny][nx] == self.EMPTY:
-                        break
-                    if self.board[ny][nx] == player:
-                        return True
-                    nx += dx
-                    ny += dy
-        return False
+        return flip_mask_for_square(i, P, O) != 0
 
     def make_move(self, x: int, y: int, player: int, token: str) -> bool:
         # Check token
@@ -111,10 +243,10 @@ class ReversiGame:
             return False
         if player == self.WHITE and token != self.white_token:
             return False
-        
+
         if self.is_over or self.current_turn != player:
             return False
-        
+
         # Check cooldown
         if time.time() - self.last_move_time < self.settings.turn_cooldown:
             return False
@@ -122,39 +254,34 @@ class ReversiGame:
         if not self.can_move(x, y, player):
             return False
 
-        # Execute move
-        self.board[y][x] = player
+        # Board is about to change: drop the memoized move list
+        self._cached_valid_moves = None
+
+        # Execute move (places the piece and flips the sandwiched lines)
         self.flip_pieces(x, y, player)
-        
+
         self.last_move_time = time.time()
         self.history.append((x, y, player))
-        
+
         # Switch turn
         self.next_turn()
         return True
 
     def flip_pieces(self, x: int, y: int, player: int):
-        opponent = self.WHITE if player == self.BLACK else self.BLACK
-        directions = [
-            (0, -1), (1, -1), (1, 0), (1, 1),
-            (0, 1), (-1, 1), (-1, 0), (-1, -1)
-        ]
-        
-        for dx, dy in directions:
-            to_flip = []
-            nx, ny = x + dx, y + dy
-            while self.is_valid_coord(nx, ny) and self.board[ny][nx] == opponent:
-                to_flip.append((nx, ny))
-                nx += dx
-                ny += dy
-            
-            if self.is_valid_coord(nx, ny) and self.board[ny][nx] == player:
-                for fx, fy in to_flip:
-                    self.board[fy][fx] = player
+        i = y * 8 + x
+        move_bit = 1 << i
+        P, O = self._player_bbs(player)
+        flips = flip_mask_for_square(i, P, O)
+        if player == self.BLACK:
+            self.black_bb |= move_bit | flips
+            self.white_bb ^= flips
+        else:
+            self.white_bb |= move_bit | flips
+            self.black_bb ^= flips
 
     def next_turn(self):
         opponent = self.WHITE if self.current_turn == self.BLACK else self.BLACK
-        
+
         if self.get_valid_moves(opponent):
             self.current_turn = opponent
         elif self.get_valid_moves(self.current_turn):
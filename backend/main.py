@@ -3,16 +3,44 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, StreamingResponse, RedirectResponse
 from sse_starlette.sse import EventSourceResponse
-from typing import Dict, List
+from typing import Dict, Optional, Set, Tuple
 import asyncio
 import os
-import json
+from collections import defaultdict
+import orjson
 import uvicorn
 from .game import ReversiGame, GameSettings
 import uuid
 
+# Redis is optional: set REDIS_URL to back game state with Redis and route
+# events through pub/sub, which lets multiple uvicorn workers share games
+# and keeps them alive across restarts. Without it, everything stays in
+# process-local dicts (single worker only).
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import WatchError
+except ImportError:
+    aioredis = None
+    WatchError = None
+
+REDIS_URL = os.environ.get("REDIS_URL")
+redis_client = None
+
 app = FastAPI(title="Reversi API")
 
+@app.on_event("startup")
+async def init_redis():
+    global redis_client
+    if REDIS_URL:
+        if aioredis is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+        redis_client = aioredis.from_url(REDIS_URL)
+
+@app.on_event("shutdown")
+async def close_redis():
+    if redis_client is not None:
+        await redis_client.close()
+
 # Enable CORS for frontend development
 app.add_middleware(
     CORSMiddleware,
@@ -21,86 +49,207 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory store for active games
+# In-memory store for active games (fallback when Redis is not configured)
 games: Dict[str, ReversiGame] = {}
-# Event bus: game_id -> list of asyncio.Queue
-game_listeners: Dict[str, List[asyncio.Queue]] = {}
+# Event bus: game_id -> set of asyncio.Queue (set so a disconnecting
+# listener is removed in O(1) regardless of spectator count)
+game_listeners: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+# Events awaiting delivery, merged per (game, event type) within the
+# coalescing window; keying by type keeps a claim from swallowing a move
+pending_events: Dict[Tuple[str, str], dict] = {}
+# Strong references to in-flight flush tasks: the event loop only keeps
+# weak ones, so an unreferenced task can be garbage-collected mid-sleep
+# and its event silently dropped
+_flush_tasks: Set[asyncio.Task] = set()
+
+def _game_key(game_id: str) -> str:
+    return f"game:{game_id}"
+
+def _game_channel(game_id: str) -> str:
+    return f"game:{game_id}:events"
+
+async def game_exists(game_id: str) -> bool:
+    if redis_client is None:
+        return game_id in games
+    return bool(await redis_client.exists(_game_key(game_id)))
+
+async def load_game(game_id: str):
+    if redis_client is None:
+        return games.get(game_id)
+    raw = await redis_client.get(_game_key(game_id))
+    if raw is None:
+        return None
+    return ReversiGame.from_dict(orjson.loads(raw))
+
+async def save_game(game: ReversiGame):
+    if redis_client is None:
+        games[game.game_id] = game
+    else:
+        await redis_client.set(_game_key(game.game_id), orjson.dumps(game.to_dict()))
+
+async def update_game(game_id: str, mutate):
+    # Load-mutate-store. With Redis the cycle runs under WATCH so a
+    # concurrent writer on another worker triggers a retry instead of a
+    # lost update. Returns (game, mutate result), or (None, None) when
+    # the game does not exist.
+    if redis_client is None:
+        game = games.get(game_id)
+        if game is None:
+            return None, None
+        return game, mutate(game)
+
+    key = _game_key(game_id)
+    while True:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.watch(key)
+            raw = await pipe.get(key)
+            if raw is None:
+                await pipe.reset()
+                return None, None
+            game = ReversiGame.from_dict(orjson.loads(raw))
+            result = mutate(game)
+            pipe.multi()
+            pipe.set(key, orjson.dumps(game.to_dict()))
+            try:
+                await pipe.execute()
+            except WatchError:
+                continue
+            return game, result
+
+# Rapid event sequences (e.g. claim followed by move) within this window
+# are merged into a single broadcast
+BROADCAST_COALESCE_WINDOW = 0.01
+
+async def _flush_event(game_id: str, event_type: str):
+    await asyncio.sleep(BROADCAST_COALESCE_WINDOW)
+    data = pending_events.pop((game_id, event_type), None)
+    if data is None:
+        return
+    # Serialize once (orjson is several times faster than stdlib json on
+    # the nested board/move lists), then fan out
+    payload = orjson.dumps(data).decode()
+    if redis_client is not None:
+        # Pub/sub reaches SSE listeners on every worker, not just this one
+        await redis_client.publish(_game_channel(game_id), payload)
+        return
+    listeners = game_listeners.get(game_id)
+    if not listeners:
+        return
+    for queue in list(listeners):
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Evict the oldest event so a stalled consumer sees the newest
+            # instead of blocking the flush for everyone
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                pass
 
 async def broadcast_event(game_id: str, data: dict):
-    if game_id in game_listeners:
-        for queue in game_listeners[game_id]:
-            await queue.put(json.dumps(data))
+    event_type = data.get("type")
+    key = (game_id, event_type)
+    if key in pending_events:
+        # A flush is already scheduled for this event type: merge so
+        # listeners see only the freshest fields
+        pending_events[key].update(data)
+        return
+    pending_events[key] = dict(data)
+    task = asyncio.create_task(_flush_event(game_id, event_type))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
 @app.post("/game/create")
-async def create_game(settings: GameSettings = Body(...)):
+async def create_game(settings: Optional[GameSettings] = Body(None)):
+    # settings=None falls through to the shared default in ReversiGame
     game = ReversiGame(settings)
-    games[game.game_id] = game
+    await save_game(game)
     return {"game_id": game.game_id}
 
 @app.post("/game/{game_id}/claim")
 async def claim_side(game_id: str, payload: dict = Body(...)):
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[game_id]
     player = payload.get("player")
-    
-    if player not in [game.BLACK, game.WHITE]:
+
+    if player not in [ReversiGame.BLACK, ReversiGame.WHITE]:
         raise HTTPException(status_code=400, detail="Invalid player side")
-    
-    token = game.claim_side(player)
+
+    game, token = await update_game(game_id, lambda game: game.claim_side(player))
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game not found")
     if token is None:
         raise HTTPException(status_code=400, detail="Side already claimed")
-    
+
     # Broadcast change
     await broadcast_event(game_id, {"type": "claim", "slots": game.get_state()["slots"]})
-    
+
     return {"token": token, "player": player}
 
 @app.get("/game/{game_id}")
 async def get_game_state(game_id: str):
-    if game_id not in games:
+    game = await load_game(game_id)
+    if game is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    return games[game_id].get_state()
+    return game.get_state()
 
 @app.post("/game/{game_id}/move")
 async def make_move(game_id: str, payload: dict = Body(...)):
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    game = games[game_id]
     x = payload.get("x")
     y = payload.get("y")
     player = payload.get("player")
     token = payload.get("token")
-    
+
     if any(v is None for v in [x, y, player, token]):
         raise HTTPException(status_code=400, detail="Missing required fields: x, y, player, token")
-    
-    success = game.make_move(x, y, player, token)
+
+    game, success = await update_game(
+        game_id, lambda game: game.make_move(x, y, player, token))
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game not found")
     if not success:
         raise HTTPException(status_code=400, detail="Invalid move or unauthorized")
-    
+
     state = game.get_state()
     # Broadcast move
     await broadcast_event(game_id, {"type": "move", "state": state})
-    
+
     return state
 
 @app.get("/game/{game_id}/events")
 async def game_events(game_id: str, request: Request):
-    if game_id not in games:
+    if not await game_exists(game_id):
         raise HTTPException(status_code=404, detail="Game not found")
-    
+
+    async def redis_event_generator():
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(_game_channel(game_id))
+        try:
+            while True:
+                if await request.is_disconnected():
+                    break
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=15)
+                if message is None:
+                    # Keep-alive comment so proxies don't close the idle stream
+                    yield {"comment": "keep-alive"}
+                    continue
+                data = message["data"]
+                yield {"data": data.decode() if isinstance(data, bytes) else data}
+        finally:
+            await pubsub.unsubscribe(_game_channel(game_id))
+            await pubsub.close()
+
     async def event_generator():
-        queue = asyncio.Queue()
-        if game_id not in game_listeners:
-            game_listeners[game_id] = []
-        game_listeners[game_id].append(queue)
+        # Bounded so one stalled consumer can't buffer unbounded state
+        queue = asyncio.Queue(maxsize=64)
+        game_listeners[game_id].add(queue)
         
         try:
             while True:
@@ -108,13 +257,20 @@ async def game_events(game_id: str, request: Request):
                 if await request.is_disconnected():
                     break
                 
-                data = await queue.get()
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keep-alive comment so proxies don't close the idle stream
+                    yield {"comment": "keep-alive"}
+                    continue
                 yield {"data": data}
         finally:
-            game_listeners[game_id].remove(queue)
+            game_listeners[game_id].discard(queue)
             if not game_listeners[game_id]:
-                del game_listeners[game_id]
+                game_listeners.pop(game_id, None)
 
+    if redis_client is not None:
+        return EventSourceResponse(redis_event_generator())
     return EventSourceResponse(event_generator())
 
 # Browser Routes
@@ -123,23 +279,25 @@ async def game_events(game_id: str, request: Request):
 async def new_game_redirect():
     # Create a default game and redirect
     game = ReversiGame()
-    games[game.game_id] = game
+    await save_game(game)
     return RedirectResponse(url=f"/play/{game.game_id}")
 
 @app.get("/play/{game_id}")
 async def serve_game(game_id: str):
-    if game_id not in games:
+    if not await game_exists(game_id):
         return RedirectResponse(url="/play/")
     return FileResponse("frontend/index.html")
 
-# Serve static assets (CSS/JS)
-@app.get("/{filename}")
-async def get_site_files(filename: str):
-    file_path = os.path.join("frontend", filename)
-    if os.path.exists(file_path) and os.path.isfile(file_path):
-        return FileResponse(file_path)
-    raise HTTPException(status_code=404)
+# Serve static assets (CSS/JS). Mounted after the API routes so those
+# keep precedence; StaticFiles caches directory state and streams files
+# instead of stat-ing paths by hand on every request.
+app.mount("/", StaticFiles(directory="frontend"), name="static")
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop + httptools (bundled with uvicorn[standard]) cut event-loop
+    # and HTTP-parsing overhead. More than one worker needs Redis-backed
+    # state, so the default stays at 1 unless REDIS_URL is configured.
+    workers = int(os.environ.get("WEB_CONCURRENCY", "2" if REDIS_URL else "1"))
+    uvicorn.run("backend.main:app", host="0.0.0.0", port=port,
+                loop="uvloop", http="httptools", workers=workers)
@@ -16,6 +16,16 @@ def test_valid_moves_initial():
     expected = [(3, 2), (2, 3), (5, 4), (4, 5)]
     assert set(moves) == set(expected)
 
+def test_valid_moves_cached_and_invalidated():
+    game = ReversiGame()
+    first = game.get_valid_moves(game.BLACK)
+    # Repeat read returns the memoized list
+    assert game.get_valid_moves(game.BLACK) is first
+    game.make_move(3, 2, game.BLACK, game.black_token)
+    # Board changed: White's moves must be freshly computed
+    moves = game.get_valid_moves(game.WHITE)
+    assert set(moves) == {(2, 2), (4, 2), (2, 4)}
+
 def test_make_move():
     game = ReversiGame()
     # Black moves to (3, 2)